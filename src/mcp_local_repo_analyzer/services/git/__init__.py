@@ -3,12 +3,13 @@
 This module provides specialized Git operations including change detection,
 diff analysis, and status tracking for repository monitoring.
 """
-from .change_detector import ChangeDetector
+from .change_detector import ChangeDetector, StatusSummary
 from .diff_analyzer import DiffAnalyzer
 from .status_tracker import StatusTracker
 
 __all__ = [
     "ChangeDetector",
     "DiffAnalyzer",
+    "StatusSummary",
     "StatusTracker",
 ]
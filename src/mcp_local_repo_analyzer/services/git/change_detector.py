@@ -1,7 +1,8 @@
 """Service for detecting different types of git changes."""
 
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 from mcp_shared_lib.models import (
     FileStatus,
@@ -18,6 +19,14 @@ if TYPE_CHECKING:
     from fastmcp import Context
 
 
+@dataclass(frozen=True, slots=True)
+class StatusSummary:
+    """Counts-only view of repository status for cheap dirty checks."""
+
+    dirty: bool
+    counts: dict[str, int] = field(default_factory=dict)
+
+
 class ChangeDetector:
     """Service for detecting different types of git changes."""
 
@@ -26,15 +35,76 @@ class ChangeDetector:
         self.git_client = git_client
         self.logger = logging_service.get_logger(__name__)
 
-    async def detect_working_directory_changes(
+    async def detect_dirty_summary(
         self, repo: LocalRepository, ctx: Optional["Context"] = None
+    ) -> StatusSummary:
+        """Detect whether the repository is dirty without building per-file models.
+
+        Runs a single ``git status --porcelain=v2 -z --no-renames`` and tallies
+        entries by their leading character. No ``FileStatus`` objects are
+        created and no per-file diff stats are requested.
+        """
+        if ctx:
+            await ctx.debug("Detecting repository dirty summary")
+
+        try:
+            output = await self.git_client.execute_command(
+                repo.path,
+                ["status", "--porcelain=v2", "-z", "--no-renames"],
+                ctx=ctx,
+            )
+
+            staged = unstaged = untracked = conflicted = 0
+            for entry in output.split("\0"):
+                if not entry:
+                    continue
+                kind = entry[0]
+                if kind in ("1", "2"):
+                    # Ordinary entries: "1 XY ...", "." marks an unchanged side
+                    if entry[2] != ".":
+                        staged += 1
+                    if entry[3] != ".":
+                        unstaged += 1
+                elif kind == "u":
+                    conflicted += 1
+                elif kind == "?":
+                    untracked += 1
+
+            counts = {
+                "staged": staged,
+                "unstaged": unstaged,
+                "untracked": untracked,
+                "conflicted": conflicted,
+            }
+            summary = StatusSummary(dirty=any(counts.values()), counts=counts)
+
+            if ctx:
+                await ctx.debug(f"Dirty summary: {counts}")
+
+            return summary
+
+        except Exception as e:
+            if ctx:
+                await ctx.error(f"Failed to detect dirty summary: {str(e)}")
+            raise
+
+    async def detect_working_directory_changes(
+        self,
+        repo: LocalRepository,
+        ctx: Optional["Context"] = None,
+        status_info: Optional[dict[str, Any]] = None,
     ) -> WorkingDirectoryChanges:
-        """Detect uncommitted changes in working directory (changes NOT YET staged)."""
+        """Detect uncommitted changes in working directory (changes NOT YET staged).
+
+        Pass ``status_info`` from an earlier ``GitClient.get_status`` call to
+        reuse it instead of running ``git status`` again.
+        """
         if ctx:
             await ctx.debug("Detecting working directory changes (unstaged only)")
 
         try:
-            status_info = await self.git_client.get_status(repo.path, ctx)
+            if status_info is None:
+                status_info = await self.git_client.get_status(repo.path, ctx)
             if ctx:
                 await ctx.debug(f"Raw git status info: {status_info}")
 
@@ -191,14 +261,22 @@ class ChangeDetector:
             raise
 
     async def detect_staged_changes(
-        self, repo: LocalRepository, ctx: Optional["Context"] = None
+        self,
+        repo: LocalRepository,
+        ctx: Optional["Context"] = None,
+        status_info: Optional[dict[str, Any]] = None,
     ) -> StagedChanges:
-        """Detect changes staged for commit (changes IN THE INDEX)."""
+        """Detect changes staged for commit (changes IN THE INDEX).
+
+        Pass ``status_info`` from an earlier ``GitClient.get_status`` call to
+        reuse it instead of running ``git status`` again.
+        """
         if ctx:
             await ctx.debug("Detecting staged changes (in index only)")
 
         try:
-            status_info = await self.git_client.get_status(repo.path, ctx)
+            if status_info is None:
+                status_info = await self.git_client.get_status(repo.path, ctx)
 
             staged_files = []
 
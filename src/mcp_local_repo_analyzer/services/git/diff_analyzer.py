@@ -1,6 +1,10 @@
 """Service for analyzing git diffs and generating insights."""
 
+import fnmatch
+import functools
+import heapq
 import re
+from collections.abc import Iterator
 from typing import Any
 
 from fastmcp.server.dependencies import get_context
@@ -17,6 +21,151 @@ from mcp_shared_lib.utils.logging_utils import get_logger
 
 logger = get_logger(__name__)
 
+# Diff parsing patterns, compiled once at import
+_GIT_HEADER_RE = re.compile(r"^diff --git a/(.+?) b/(.+)$", re.MULTILINE)
+_HUNK_HEADER_RE = re.compile(
+    r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@.*\n?", re.MULTILINE
+)
+_NON_HUNK_LINE_RE = re.compile(r"^(?:[^ +\-\n].*)?(?:\n|\Z)", re.MULTILINE)
+_BINARY_RE = re.compile(r"^Binary files ", re.MULTILINE)
+_HUNK_START_RE = re.compile(r"^@@", re.MULTILINE)
+_NEW_FILE_LINE_RE = re.compile(r"^\+\+\+ .*$", re.MULTILINE)
+
+# Classification tables, built once at import. Extensions and exact filenames
+# are frozensets for constant-time lookup; multi-part suffixes are a tuple so
+# a single str.endswith() call checks the whole family.
+_CRITICAL_NAMES = frozenset(
+    {
+        "dockerfile",
+        "makefile",
+        "cmakelists.txt",
+        "build.gradle",
+        "pom.xml",
+        "composer.json",
+        "package-lock.json",
+        "yarn.lock",
+        ".gitignore",
+        ".gitattributes",
+        "license",
+        "readme.md",
+    }
+)
+_CODE_EXTENSIONS = frozenset(
+    {
+        "py",
+        "js",
+        "ts",
+        "jsx",
+        "tsx",
+        "java",
+        "cpp",
+        "c",
+        "h",
+        "hpp",
+        "cs",
+        "rs",
+        "go",
+        "rb",
+        "php",
+        "swift",
+        "kt",
+        "scala",
+        "clj",
+        "hs",
+        "ml",
+        "fs",
+        "vb",
+        "dart",
+        "lua",
+        "r",
+        "m",
+        "mm",
+    }
+)
+_DOC_PATTERNS = ("readme", "doc", "docs/", "/doc/", "documentation")
+_DOC_EXTENSIONS = frozenset({"md", "rst", "txt", "adoc", "tex"})
+_TEST_PATTERNS = (
+    "test_",
+    "_test.",
+    "spec_",
+    "_spec.",
+    "/tests/",
+    "/test/",
+    "__tests__/",
+    ".test.",
+    ".spec.",
+    "testing/",
+    "spec/",
+)
+_CONFIG_EXTENSIONS = frozenset(
+    {
+        "json",
+        "yaml",
+        "yml",
+        "toml",
+        "ini",
+        "cfg",
+        "conf",
+        "properties",
+        "xml",
+        "env",
+    }
+)
+_CONFIG_PATTERNS = ("config", "settings", ".env")
+_CONFLICT_SUFFIXES = (
+    ".json",
+    ".xml",
+    ".yaml",
+    ".yml",
+    ".lock",
+    "package-lock.json",
+    "yarn.lock",
+    "poetry.lock",
+)
+_CONFLICT_PATTERNS = ("migration", "schema", "database", "config")
+
+# Each substring family is one alternation, matched in a single regex scan
+_DOC_RE = re.compile("|".join(map(re.escape, _DOC_PATTERNS)))
+_TEST_RE = re.compile("|".join(map(re.escape, _TEST_PATTERNS)))
+_CONFIG_RE = re.compile("|".join(map(re.escape, _CONFIG_PATTERNS)))
+_CONFLICT_RE = re.compile("|".join(map(re.escape, _CONFLICT_PATTERNS)))
+
+
+def _extension(path: str) -> str:
+    """Return the lowercased text after the last dot in path, or ''."""
+    dot = path.rfind(".")
+    return path[dot + 1 :].lower() if dot != -1 else ""
+
+
+def _glob_prefix_regex(pattern: str) -> str:
+    """Translate a glob to a regex without fnmatch's end-of-string anchor."""
+    regex = fnmatch.translate(pattern)
+    for anchor in (r"\Z", r"\z"):
+        regex = regex.removesuffix(anchor)
+    return regex
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_critical_patterns(
+    patterns: tuple[str, ...],
+) -> tuple[re.Pattern[str] | None, tuple[str, ...]]:
+    """Split critical patterns into one compiled glob regex and literals.
+
+    Cached on the pattern tuple so analyzers built from equal settings share
+    the compiled state. Globs match a prefix of the path, so "*.env" also
+    flags ".env.local"; literals are matched as lowercase substrings.
+    """
+    glob_patterns = [p for p in patterns if any(c in p for c in "*?[")]
+    critical_regex = (
+        re.compile(
+            "|".join(_glob_prefix_regex(p) for p in glob_patterns), re.IGNORECASE
+        )
+        if glob_patterns
+        else None
+    )
+    literals = tuple(p.lower() for p in patterns if p not in glob_patterns)
+    return critical_regex, literals
+
 
 class DiffAnalyzer:
     """Service for analyzing git diffs and generating insights."""
@@ -25,6 +174,14 @@ class DiffAnalyzer:
         """Initialize diff analyzer with settings."""
         self.settings = settings
 
+        self._critical_regex, self._critical_literals = _compile_critical_patterns(
+            tuple(settings.critical_file_patterns)
+        )
+
+        # categorize_changes, assess_risk and generate_insights each classify
+        # the same paths, so remember each path's category per instance
+        self._categories: dict[str, str] = {}
+
     def _get_context(self) -> Any:
         """Get FastMCP context if available."""
         try:
@@ -47,62 +204,119 @@ class DiffAnalyzer:
         # Use regular logger (sync, safe)
         getattr(logger, level.lower())(message)
 
-    def parse_diff(self, diff_content: str) -> list[FileDiff]:
-        """Parse diff content into FileDiff objects."""
+    def parse_diff(
+        self, diff_content: str | bytes, *, deltas_only: bool = False
+    ) -> list[FileDiff]:
+        """Parse diff content into FileDiff objects.
+
+        With ``deltas_only`` the hunks are not parsed; paths, binary flags and
+        line counts are still filled in.
+        """
         self._log_if_context(
-            "debug", f"Parsing diff content ({len(diff_content)} characters)"
+            "debug", f"Parsing diff content (length {len(diff_content)})"
         )
 
-        file_diffs = []
-
-        # Split diff into files
-        file_sections = re.split(r"^diff --git", diff_content, flags=re.MULTILINE)
+        file_diffs = list(self.iter_file_diffs(diff_content, deltas_only=deltas_only))
 
+        total_changes = sum(fd.total_changes for fd in file_diffs)
         self._log_if_context(
-            "debug", f"Found {len(file_sections)} file sections in diff"
+            "debug",
+            f"Parsed {len(file_diffs)} file diffs with {total_changes} total changes",
         )
 
-        for i, section in enumerate(file_sections):
-            if not section.strip():
-                continue
+        return file_diffs
 
+    def iter_file_diffs(
+        self, diff_content: str | bytes, *, deltas_only: bool = False
+    ) -> Iterator[FileDiff]:
+        """Lazily parse diff content, yielding one FileDiff per file section.
+
+        Raw ``bytes`` from git are decoded once as UTF-8.
+        """
+        if isinstance(diff_content, bytes):
+            diff_content = diff_content.decode("utf-8", errors="replace")
+        for i, (section, header_old_path, header_new_path) in enumerate(
+            self._iter_file_sections(diff_content)
+        ):
             try:
-                file_diff = self._parse_file_diff(section)
-                if file_diff:
-                    file_diffs.append(file_diff)
+                file_diff = self._parse_file_diff(
+                    section,
+                    old_path=header_old_path,
+                    file_path=header_new_path,
+                    deltas_only=deltas_only,
+                )
             except Exception as e:
                 self._log_if_context(
                     "warning", f"Failed to parse file diff section {i}: {str(e)}"
                 )
                 continue
-
-        total_changes = sum(fd.total_changes for fd in file_diffs)
-        self._log_if_context(
-            "debug",
-            f"Parsed {len(file_diffs)} file diffs with {total_changes} total changes",
-        )
-
-        return file_diffs
-
-    def _parse_file_diff(self, diff_section: str) -> FileDiff | None:
-        """Parse a single file diff section."""
-        lines = diff_section.split("\n")
+            if file_diff:
+                yield file_diff
+
+    def _iter_file_sections(
+        self, diff_content: str
+    ) -> Iterator[tuple[str, str | None, str | None]]:
+        """Yield ``(section, old_path, new_path)`` slices between diff headers."""
+        previous = None
+        for match in _GIT_HEADER_RE.finditer(diff_content):
+            if previous is not None:
+                yield (
+                    diff_content[previous.start() : match.start()],
+                    previous.group(1),
+                    previous.group(2),
+                )
+            elif diff_content[: match.start()].strip():
+                # Text before the first header is parsed as its own section
+                yield diff_content[: match.start()], None, None
+            previous = match
+
+        if previous is not None:
+            yield diff_content[previous.start() :], previous.group(1), previous.group(2)
+        elif diff_content.strip():
+            # Headerless input (e.g. plain unified diff) is parsed as one section
+            yield diff_content, None, None
+
+    def _parse_file_diff(
+        self,
+        diff_section: str,
+        old_path: str | None = None,
+        file_path: str | None = None,
+        deltas_only: bool = False,
+    ) -> FileDiff | None:
+        """Parse a single file diff section.
+
+        ``old_path``/``file_path`` come from the ``diff --git`` header when
+        known; ``---``/``+++`` lines in the section take precedence.
+        """
+        # The header ends at the first @@ line, even a malformed one, or else
+        # after the +++ line; binary sections have neither, so only the header
+        # needs checking for the binary marker
+        first_hunk = _HUNK_START_RE.search(diff_section)
+        if first_hunk:
+            hunks_at = first_hunk.start()
+        else:
+            new_file_line = _NEW_FILE_LINE_RE.search(diff_section)
+            hunks_at = new_file_line.end() if new_file_line else len(diff_section)
+        header = diff_section[:hunks_at]
+        is_binary = _BINARY_RE.search(header) is not None
+
+        if is_binary and file_path:
+            return FileDiff(
+                file_path=file_path,
+                old_path=old_path if old_path != file_path else None,
+                diff_content=diff_section,
+                hunks=[],
+                is_binary=True,
+                lines_added=0,
+                lines_deleted=0,
+            )
 
         # Extract file paths
-        file_path = None
-        old_path = None
-
-        for line in lines:
+        for line in header.split("\n"):
             if line.startswith("--- a/"):
                 old_path = line[6:]
             elif line.startswith("+++ b/"):
                 file_path = line[6:]
-            elif line.startswith("a/") and " b/" in line:
-                # Handle the git diff header line
-                parts = line.split(" b/")
-                if len(parts) == 2:
-                    old_path = parts[0][2:]  # Remove 'a/'
-                    file_path = parts[1]
 
         if not file_path:
             self._log_if_context(
@@ -110,23 +324,21 @@ class DiffAnalyzer:
             )
             return None
 
-        # Check if binary
-        is_binary = "Binary files" in diff_section
-
         # Count additions/deletions
         additions = 0
         deletions = 0
         hunks = []
 
         if not is_binary:
-            for line in lines:
-                if line.startswith("+") and not line.startswith("+++"):
-                    additions += 1
-                elif line.startswith("-") and not line.startswith("---"):
-                    deletions += 1
+            # The body starts at an @@ line or at the newline ending the +++
+            # line, so every +/- line follows a newline
+            body = diff_section[hunks_at:]
+            additions = body.count("\n+")
+            deletions = body.count("\n-")
 
             # Parse hunks (simplified)
-            hunks = self._parse_hunks(lines)
+            if not deltas_only:
+                hunks = self._parse_hunks(body)
 
         return FileDiff(
             file_path=file_path,
@@ -138,46 +350,28 @@ class DiffAnalyzer:
             lines_deleted=deletions,
         )
 
-    def _parse_hunks(self, lines: list[str]) -> list[DiffHunk]:
-        """Parse diff hunks from lines."""
+    def _parse_hunks(self, lines: str | list[str]) -> list[DiffHunk]:
+        """Parse diff hunks from a diff body or its lines."""
+        body = lines if isinstance(lines, str) else "\n".join(lines)
+        headers = list(_HUNK_HEADER_RE.finditer(body))
         hunks = []
-        current_hunk = None
-        hunk_content: list[str] = []
-
-        for line in lines:
-            if line.startswith("@@"):
-                # Save previous hunk
-                if current_hunk:
-                    current_hunk.content = "\n".join(hunk_content)  # type: ignore[unreachable]
-                    hunks.append(current_hunk)
-                # Reset for new hunk
-                hunk_content.clear()
-
-                # Parse hunk header
-                hunk_match = re.match(r"@@ -(\d+),?(\d*) \+(\d+),?(\d*) @@", line)
-                if hunk_match:
-                    old_start = int(hunk_match.group(1))
-                    old_lines = int(hunk_match.group(2)) if hunk_match.group(2) else 1
-                    new_start = int(hunk_match.group(3))
-                    new_lines = int(hunk_match.group(4)) if hunk_match.group(4) else 1
-
-                    current_hunk = DiffHunk(
-                        old_start=old_start,
-                        old_lines=old_lines,
-                        new_start=new_start,
-                        new_lines=new_lines,
-                        content="",
-                    )
-                    hunk_content = []
-            elif current_hunk and (
-                line.startswith(" ") or line.startswith("+") or line.startswith("-")
-            ):
-                hunk_content.append(line)
-
-        # Save last hunk
-        if current_hunk:
-            current_hunk.content = "\n".join(hunk_content)
-            hunks.append(current_hunk)
+
+        for i, hunk_match in enumerate(headers):
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(body)
+            # Keep only context/added/removed lines of the hunk body
+            content = _NON_HUNK_LINE_RE.sub("", body[hunk_match.end() : end])
+
+            # Omitted line counts in "@@ -a +b @@" default to 1
+            old_start, old_lines, new_start, new_lines = hunk_match.groups()
+            hunks.append(
+                DiffHunk(
+                    old_start=int(old_start),
+                    old_lines=int(old_lines) if old_lines else 1,
+                    new_start=int(new_start),
+                    new_lines=int(new_lines) if new_lines else 1,
+                    content=content.rstrip("\n"),
+                )
+            )
 
         return hunks
 
@@ -185,38 +379,26 @@ class DiffAnalyzer:
         """Categorize changed files by type."""
         self._log_if_context("debug", f"Categorizing {len(files)} changed files")
 
-        critical_files = []
-        source_code = []
-        documentation = []
-        tests = []
-        configuration = []
-        other = []
+        buckets: dict[str, list[str]] = {
+            "critical_files": [],
+            "source_code": [],
+            "documentation": [],
+            "tests": [],
+            "configuration": [],
+            "other": [],
+        }
 
         for file_status in files:
-            path = file_status.path.lower()
-
-            # Check categories in order of specificity
-            if self._is_critical_file(file_status.path):
-                critical_files.append(file_status.path)
-            elif self._is_test_file(path):
-                tests.append(file_status.path)
-            elif self._is_source_code(path):
-                source_code.append(file_status.path)
-            elif self._is_documentation(path):
-                documentation.append(file_status.path)
-            elif self._is_configuration(path):
-                configuration.append(file_status.path)
-            else:
-                other.append(file_status.path)
-
-        categories = ChangeCategorization(
-            critical_files=critical_files,
-            source_code=source_code,
-            documentation=documentation,
-            tests=tests,
-            configuration=configuration,
-            other=other,
-        )
+            buckets[self._classify(file_status.path)].append(file_status.path)
+
+        critical_files = buckets["critical_files"]
+        source_code = buckets["source_code"]
+        documentation = buckets["documentation"]
+        tests = buckets["tests"]
+        configuration = buckets["configuration"]
+        other = buckets["other"]
+
+        categories = ChangeCategorization(**buckets)
 
         self._log_if_context(
             "debug",
@@ -244,16 +426,22 @@ class DiffAnalyzer:
         critical_file_changes = 0
         total_line_changes = 0
 
+        # Hoist loop invariants; everything below is a single pass over changes
+        large_file_threshold = self.settings.large_file_threshold
+        classify = self._classify
+
         for file_status in changes:
+            file_changes = file_status.total_changes
+
             # Check for large changes
-            if file_status.total_changes > self.settings.large_file_threshold:
+            if file_changes > large_file_threshold:
                 large_changes.append(file_status.path)
 
             # Track total line changes
-            total_line_changes += file_status.total_changes
+            total_line_changes += file_changes
 
             # Check for critical files
-            if self._is_critical_file(file_status.path):
+            if classify(file_status.path) == "critical_files":
                 critical_file_changes += 1
 
             # Check for binary files
@@ -319,124 +507,71 @@ class DiffAnalyzer:
 
         return risk_assessment
 
+    def _classify(self, file_path: str) -> str:
+        """Return the ChangeCategorization field a path belongs to, cached."""
+        category = self._categories.get(file_path)
+        if category is None:
+            category = self._categories[file_path] = self._categorize_path(file_path)
+        return category
+
+    def _categorize_path(self, file_path: str) -> str:
+        """Work out the ChangeCategorization field a path belongs to."""
+        # Check categories in order of specificity, lowercasing the path once
+        if self._is_critical_file(file_path):
+            return "critical_files"
+
+        path_lower = file_path.lower()
+        if _TEST_RE.search(path_lower):
+            return "tests"
+
+        ext = _extension(path_lower)
+        if ext in _CODE_EXTENSIONS:
+            return "source_code"
+        if _DOC_RE.search(path_lower) or ext in _DOC_EXTENSIONS:
+            return "documentation"
+        if ext in _CONFIG_EXTENSIONS or _CONFIG_RE.search(path_lower):
+            return "configuration"
+        return "other"
+
     def _is_critical_file(self, file_path: str) -> bool:
         """Check if file is considered critical."""
-        for pattern in self.settings.critical_file_patterns:
-            if self._matches_pattern(file_path, pattern):
-                return True
-
-        # Additional critical file patterns
-        critical_names = [
-            "dockerfile",
-            "makefile",
-            "cmakelists.txt",
-            "build.gradle",
-            "pom.xml",
-            "composer.json",
-            "package-lock.json",
-            "yarn.lock",
-            ".gitignore",
-            ".gitattributes",
-            "license",
-            "readme.md",
-        ]
+        if self._critical_regex and self._critical_regex.match(file_path):
+            return True
 
-        filename_lower = file_path.lower().split("/")[-1]  # Get just the filename
-        return filename_lower in critical_names
+        path_lower = file_path.lower()
+        if any(literal in path_lower for literal in self._critical_literals):
+            return True
+
+        filename_lower = path_lower.split("/")[-1]  # Get just the filename
+        return filename_lower in _CRITICAL_NAMES
 
     def _is_source_code(self, file_path: str) -> bool:
         """Check if file is source code."""
-        code_extensions = [
-            ".py",
-            ".js",
-            ".ts",
-            ".jsx",
-            ".tsx",
-            ".java",
-            ".cpp",
-            ".c",
-            ".h",
-            ".hpp",
-            ".cs",
-            ".rs",
-            ".go",
-            ".rb",
-            ".php",
-            ".swift",
-            ".kt",
-            ".scala",
-            ".clj",
-            ".hs",
-            ".ml",
-            ".fs",
-            ".vb",
-            ".dart",
-            ".lua",
-            ".r",
-            ".m",
-            ".mm",
-        ]
-        return any(file_path.endswith(ext) for ext in code_extensions)
+        return _extension(file_path) in _CODE_EXTENSIONS
 
     def _is_documentation(self, file_path: str) -> bool:
         """Check if file is documentation."""
-        doc_patterns = ["readme", "doc", "docs/", "/doc/", "documentation"]
-        doc_extensions = [".md", ".rst", ".txt", ".adoc", ".tex"]
-
         path_lower = file_path.lower()
 
-        return any(pattern in path_lower for pattern in doc_patterns) or any(
-            path_lower.endswith(ext) for ext in doc_extensions
+        return (
+            _DOC_RE.search(path_lower) is not None
+            or _extension(path_lower) in _DOC_EXTENSIONS
         )
 
     def _is_test_file(self, file_path: str) -> bool:
         """Check if file is a test file."""
-        test_patterns = [
-            "test_",
-            "_test.",
-            "spec_",
-            "_spec.",
-            "/tests/",
-            "/test/",
-            "__tests__/",
-            ".test.",
-            ".spec.",
-            "testing/",
-            "spec/",
-        ]
-        return any(pattern in file_path.lower() for pattern in test_patterns)
+        path_lower = file_path.lower()
+        return _TEST_RE.search(path_lower) is not None
 
     def _is_configuration(self, file_path: str) -> bool:
         """Check if file is configuration."""
-        config_extensions = [
-            ".json",
-            ".yaml",
-            ".yml",
-            ".toml",
-            ".ini",
-            ".cfg",
-            ".conf",
-            ".properties",
-            ".xml",
-            ".env",
-        ]
-        config_patterns = ["config", "settings", ".env"]
-
         path_lower = file_path.lower()
 
-        return any(path_lower.endswith(ext) for ext in config_extensions) or any(
-            pattern in path_lower for pattern in config_patterns
+        return (
+            _extension(path_lower) in _CONFIG_EXTENSIONS
+            or _CONFIG_RE.search(path_lower) is not None
         )
 
-    def _matches_pattern(self, file_path: str, pattern: str) -> bool:
-        """Check if file path matches pattern (simplified glob)."""
-        if "*" in pattern:
-            # Simple wildcard matching
-            pattern_regex = pattern.replace("*", ".*").replace("?", ".")
-            return bool(re.match(pattern_regex, file_path, re.IGNORECASE))
-
-        return pattern.lower() in file_path.lower()
-
     def _might_cause_conflicts(self, file_status: FileStatus) -> bool:
         """Check if file might cause merge conflicts (simplified)."""
         # Heuristics for potential conflicts
@@ -446,24 +581,9 @@ class DiffAnalyzer:
             # Renamed or copied files can cause conflicts
             file_status.status_code in ["R", "C"],
             # Certain file types are more prone to conflicts
-            any(
-                file_status.path.endswith(ext)
-                for ext in [
-                    ".json",
-                    ".xml",
-                    ".yaml",
-                    ".yml",
-                    ".lock",
-                    "package-lock.json",
-                    "yarn.lock",
-                    "poetry.lock",
-                ]
-            ),
+            file_status.path.endswith(_CONFLICT_SUFFIXES),
             # Files in common conflict-prone directories
-            any(
-                pattern in file_status.path.lower()
-                for pattern in ["migration", "schema", "database", "config"]
-            ),
+            _CONFLICT_RE.search(file_status.path.lower()) is not None,
         ]
 
         return any(conflict_indicators)
@@ -475,22 +595,24 @@ class DiffAnalyzer:
         categories = self.categorize_changes(changes)
         risk_assessment = self.assess_risk(changes)
 
-        # Calculate statistics
-        total_additions = sum(f.lines_added for f in changes)
-        total_deletions = sum(f.lines_deleted for f in changes)
-        total_changes = sum(f.total_changes for f in changes)
-
-        # Analyze change patterns
+        # Calculate statistics and file types in a single pass
+        total_additions = 0
+        total_deletions = 0
         file_types: dict[str, int] = {}
 
         for file_status in changes:
+            total_additions += file_status.lines_added
+            total_deletions += file_status.lines_deleted
+
             # Count file types
             if "." in file_status.path:
-                ext = file_status.path.split(".")[-1].lower()
+                ext = _extension(file_status.path)
                 file_types[ext] = file_types.get(ext, 0) + 1
 
+        total_changes = total_additions + total_deletions
+
         # Most changed files
-        most_changed = sorted(changes, key=lambda f: f.total_changes, reverse=True)[:5]
+        most_changed = heapq.nlargest(5, changes, key=lambda f: f.total_changes)
 
         insights = {
             "categories": categories,
@@ -22,11 +22,17 @@ class StatusTracker:
         self, repo: LocalRepository, ctx: Optional["Context"] = None
     ) -> RepositoryStatus:
         """Get complete repository status."""
+        # Run `git status` once and share it between the working directory
+        # and staged change detectors
+        status_info = await self.git_client.get_status(repo.path, ctx)
+
         # Get all types of changes
         working_directory = await self.change_detector.detect_working_directory_changes(
-            repo, ctx
+            repo, ctx, status_info=status_info
+        )
+        staged_changes = await self.change_detector.detect_staged_changes(
+            repo, ctx, status_info=status_info
         )
-        staged_changes = await self.change_detector.detect_staged_changes(repo, ctx)
         unpushed_commits = await self.change_detector.detect_unpushed_commits(repo, ctx)
         stashed_changes = await self.change_detector.detect_stashed_changes(repo, ctx)
 
@@ -10,7 +10,7 @@ import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Optional
-from unittest.mock import Mock
+from unittest.mock import Mock, create_autospec
 
 import pytest
 
@@ -252,6 +252,72 @@ def sample_repository_state():
     }
 
 
+@pytest.fixture(scope="session")
+def git_analyzer_settings():
+    """Default GitAnalyzerSettings, read from the environment once per run."""
+    from mcp_shared_lib.config import GitAnalyzerSettings
+
+    return GitAnalyzerSettings()
+
+
+@pytest.fixture(scope="session")
+def local_repository():
+    """Unvalidated LocalRepository shared by service tests; treat as read-only."""
+    from mcp_shared_lib.models.git.repository import LocalRepository
+
+    return LocalRepository.model_construct(
+        path=Path("/tmp/test_repo"),
+        name="test_repo",
+        current_branch="main",
+        head_commit="abc123",
+        remote_url=None,
+        remote_branches=[],
+        is_dirty=False,
+        is_bare=False,
+        upstream_branch=None,
+        remotes=[],
+        branches=[],
+    )
+
+
+@pytest.fixture(scope="session")
+def git_client_autospec():
+    """GitClient autospec built once per run; use git_client_mock in tests."""
+    from mcp_shared_lib.services.git.git_client import GitClient
+
+    return create_autospec(GitClient, instance=True)
+
+
+@pytest.fixture(scope="session")
+def change_detector_autospec():
+    """ChangeDetector autospec built once per run; use change_detector_mock."""
+    from mcp_local_repo_analyzer.services.git.change_detector import ChangeDetector
+
+    return create_autospec(ChangeDetector, instance=True)
+
+
+@pytest.fixture
+def git_client_mock(git_client_autospec):
+    """Shared GitClient autospec, reset after each test.
+
+    Configure it through ``return_value``/``side_effect`` only; reassigned
+    attributes would leak into later tests.
+    """
+    yield git_client_autospec
+    git_client_autospec.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture
+def change_detector_mock(change_detector_autospec):
+    """Shared ChangeDetector autospec, reset after each test.
+
+    Configure it through ``return_value``/``side_effect`` only; reassigned
+    attributes would leak into later tests.
+    """
+    yield change_detector_autospec
+    change_detector_autospec.reset_mock(return_value=True, side_effect=True)
+
+
 @pytest.fixture
 def mock_file_analyzer():
     """Mock file analyzer for individual file analysis."""
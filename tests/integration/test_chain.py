@@ -5,9 +5,13 @@ Test the full MCP chain using proper FastMCP clients with STDIO transport
 
 import asyncio
 import json
+import os
 import sys
 from pathlib import Path
 
+from fastmcp import Client
+from fastmcp.client.transports import StdioTransport
+
 
 async def test_repo_analyzer():
     """Test the repository analyzer using FastMCP client"""
@@ -15,9 +19,6 @@ async def test_repo_analyzer():
     print("-" * 40)
 
     try:
-        from fastmcp import Client
-        from fastmcp.client.transports import StdioTransport
-
         # Create transport for repo analyzer
         transport = StdioTransport(
             command="poetry",
@@ -96,11 +97,6 @@ async def test_pr_recommender(analysis_data):
         return None
 
     try:
-        import os
-
-        from fastmcp import Client
-        from fastmcp.client.transports import StdioTransport
-
         # Create transport for PR recommender with environment variables
         transport = StdioTransport(
             command="poetry",
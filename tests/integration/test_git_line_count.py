@@ -11,7 +11,6 @@ from pathlib import Path
 import pytest
 
 
-@pytest.mark.asyncio
 @pytest.mark.integration
 async def test_debug_git_line_counts():
     """Debug test to isolate the line count calculation issue."""
@@ -196,7 +195,6 @@ async def test_debug_git_line_counts():
             pytest.skip(f"Could not import required modules: {e}")
 
 
-@pytest.mark.asyncio
 @pytest.mark.integration
 async def test_simple_git_commands():
     """Simple test to verify git commands work as expected."""
@@ -10,7 +10,6 @@ from fastmcp import Client
 @pytest.mark.skip(
     reason="Requires HTTP server running on localhost:8000 - start with 'python run_http_server.py'"
 )
-@pytest.mark.asyncio
 @pytest.mark.integration
 async def test_http_server():
     """Test the HTTP server."""
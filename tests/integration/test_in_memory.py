@@ -9,7 +9,6 @@ from fastmcp import Client
 from mcp_local_repo_analyzer.main import create_server, register_tools
 
 
-@pytest.mark.asyncio
 async def test_in_memory():
     """Test the server using in-memory transport."""
     # Create the server instance directly
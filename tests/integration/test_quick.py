@@ -1,4 +1,5 @@
 import json
+import subprocess
 
 import pytest
 from fastmcp import Client
@@ -17,8 +18,6 @@ def _extract_tool_data(raw_result):
         and hasattr(raw_result[0], "text")
     ):
         try:
-            import json
-
             return json.loads(raw_result[0].text)
         except Exception:
             return raw_result[0].text
@@ -30,8 +29,6 @@ def _extract_tool_data(raw_result):
         and isinstance(raw_result.content[0].text, str)
     ):
         try:
-            import json
-
             return json.loads(raw_result.content[0].text)
         except Exception:
             return raw_result.content[0].text
@@ -117,15 +114,12 @@ def print_dict(data, indent=0):
         print(f"{'  ' * indent}{data}")
 
 
-@pytest.mark.asyncio
 @pytest.mark.integration
 async def test_analyze_repo_with_unstaged_changes(tmp_path):
     """
     Tests the scenario where a file is modified but not staged.
     Focuses on analyze_working_directory and get_outstanding_summary.
     """
-    import subprocess
-
     # --- Setup: Create a repository with unstaged changes ---
     repo_path = tmp_path / "repo_unstaged"
     repo_path.mkdir()
@@ -240,15 +234,12 @@ async def test_analyze_repo_with_unstaged_changes(tmp_path):
     print("=" * 80 + "\n")
 
 
-@pytest.mark.asyncio
 @pytest.mark.integration
 async def test_analyze_repo_with_staged_changes(tmp_path):
     """
     Tests the scenario where a file is modified and staged.
     Focuses on analyze_staged_changes and get_outstanding_summary.
     """
-    import subprocess
-
     # --- Setup: Create a repository with staged changes ---
     repo_path = tmp_path / "repo_staged"
     repo_path.mkdir()
@@ -0,0 +1,214 @@
+"""Integration tests chaining the staging area tools over an MCP client."""
+
+import asyncio
+import os
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from fastmcp import Client, FastMCP
+
+from mcp_local_repo_analyzer.services.git.change_detector import ChangeDetector
+from mcp_local_repo_analyzer.services.git.diff_analyzer import DiffAnalyzer
+from mcp_local_repo_analyzer.tools.staging_area import register_staging_area_tools
+from mcp_shared_lib.models.analysis.categorization import ChangeCategorization
+from mcp_shared_lib.models.analysis.risk import RiskAssessment
+from mcp_shared_lib.models.git.changes import FileStatus, StagedChanges
+from mcp_shared_lib.services.git.git_client import GitClient
+
+STAGING_AREA_TOOLS = (
+    "analyze_staged_changes",
+    "preview_commit",
+    "validate_staged_changes",
+)
+
+_MODULE_PATHS = tuple(f"src/module_{i}.py" for i in range(12))
+
+# Canonical service results; tests derive variants with model_copy(update=...)
+_EMPTY_STAGED = StagedChanges()
+
+_READY_STAGED = _EMPTY_STAGED.model_copy(
+    update={
+        "staged_files": [
+            FileStatus(
+                path="src/main.py",
+                status_code="M",
+                staged=True,
+                lines_added=12,
+                lines_deleted=3,
+            ),
+            FileStatus(
+                path="tests/test_main.py", status_code="A", staged=True, lines_added=30
+            ),
+        ]
+    }
+)
+
+_LOW_RISK = RiskAssessment(risk_level="low")
+
+_EMPTY_CATEGORIZATION = ChangeCategorization()
+
+_READY_CATEGORIES = _EMPTY_CATEGORIZATION.model_copy(
+    update={"source_code": ["src/main.py"], "tests": ["tests/test_main.py"]}
+)
+
+
+async def call_tool_helper(mcp, name, **kwargs):
+    """Call a tool over an in-memory client and return its structured result."""
+    async with Client(mcp) as client:
+        result = await client.call_tool(name, kwargs)
+    return result.data
+
+
+@pytest.mark.integration
+class TestStagingAreaIntegration:
+    """Test the staging area tools together against mocked services."""
+
+    @pytest.fixture(scope="class")
+    def event_loop(self):
+        """Run every test in the class on one event loop."""
+        loop = asyncio.new_event_loop()
+        yield loop
+        loop.close()
+
+    @pytest.fixture(scope="class", autouse=True)
+    def git_repo(self, request, tmp_path_factory):
+        """Create one repository directory shared by the class's tests."""
+        path = tmp_path_factory.mktemp("repo")
+        (path / ".git").mkdir()
+        request.cls.repo_path = str(path)
+
+    @pytest.fixture(scope="class", autouse=True)
+    def mcp_env(self, request):
+        """Register the tools once against class-wide service mocks."""
+        cls = request.cls
+        cls.change_detector = AsyncMock(spec=ChangeDetector)
+        cls.diff_analyzer = Mock(spec=DiffAnalyzer)
+        cls.git_client = AsyncMock(spec=GitClient)
+        cls.mock_services = {
+            "change_detector": cls.change_detector,
+            "diff_analyzer": cls.diff_analyzer,
+            "git_client": cls.git_client,
+        }
+        cls.mcp_app = FastMCP()
+        register_staging_area_tools(cls.mcp_app, cls.mock_services)
+
+    @pytest.fixture(autouse=True)
+    def reset_services(self):
+        """Clear configured results and recorded calls after every test."""
+        yield
+        for service in self.mock_services.values():
+            service.reset_mock(return_value=True, side_effect=True)
+
+    async def test_staging_area_workflow_complete(self):
+        """Test analyze, preview and validate agree on the same staged changes."""
+        self.change_detector.detect_staged_changes.return_value = _READY_STAGED
+        self.git_client.get_diff.return_value = "+added"
+        self.diff_analyzer.categorize_changes.return_value = _READY_CATEGORIES
+        self.diff_analyzer.assess_risk.return_value = _LOW_RISK
+
+        analyze_result, preview_result, validate_result = await asyncio.gather(
+            *(
+                call_tool_helper(self.mcp_app, name, repository_path=self.repo_path)
+                for name in STAGING_AREA_TOOLS
+            )
+        )
+
+        assert analyze_result["ready_to_commit"]
+        assert analyze_result["total_staged_files"] == 2
+        assert len(analyze_result["diffs"]) == 2
+        assert preview_result["ready_to_commit"]
+        assert preview_result["summary"]["total_files"] == 2
+        assert preview_result["files_by_status"]["added"] == ["tests/test_main.py"]
+        assert validate_result["valid"]
+        assert validate_result["risk_level"] == "low"
+        assert validate_result["recommendations"] == []
+
+    async def test_validate_staged_changes_no_changes(self):
+        """Test validation does not run on an empty index."""
+        self.change_detector.detect_staged_changes.return_value = _EMPTY_STAGED
+
+        result = await call_tool_helper(
+            self.mcp_app, "validate_staged_changes", repository_path=self.repo_path
+        )
+
+        assert not result["valid"]
+        assert result["message"] == "No changes staged for commit"
+
+    async def test_validate_staged_changes_invalid_repo(self, tmp_path):
+        """Test a directory outside any git repository is reported as an error."""
+        result = await call_tool_helper(
+            self.mcp_app, "validate_staged_changes", repository_path=str(tmp_path)
+        )
+
+        assert result == {
+            "error": f"No git repository found at or above {tmp_path.resolve()}"
+        }
+        self.change_detector.detect_staged_changes.assert_not_awaited()
+
+    async def test_validate_staged_changes_service_error(self):
+        """Test change detection failures are returned as an error result."""
+        error = RuntimeError("index locked")
+        self.change_detector.detect_staged_changes.side_effect = error
+
+        result = await call_tool_helper(
+            self.mcp_app, "validate_staged_changes", repository_path=self.repo_path
+        )
+
+        assert result == {"error": "Failed to validate staged changes: index locked"}
+
+    async def test_validate_staged_changes_all_recommendations(self):
+        """Test large, critical, untested commits get every recommendation."""
+        staged = _EMPTY_STAGED.model_copy(
+            update={
+                "staged_files": [
+                    FileStatus(path=path, status_code="M", staged=True, lines_added=200)
+                    for path in _MODULE_PATHS
+                ]
+            }
+        )
+        self.change_detector.detect_staged_changes.return_value = staged
+        risk = _LOW_RISK.model_copy(
+            update={"risk_level": "medium", "large_changes": list(_MODULE_PATHS[:5])}
+        )
+        self.diff_analyzer.assess_risk.return_value = risk
+        categories = _EMPTY_CATEGORIZATION.model_copy(
+            update={
+                "critical_files": list(_MODULE_PATHS[:3]),
+                "source_code": list(_MODULE_PATHS[3:]),
+            }
+        )
+        self.diff_analyzer.categorize_changes.return_value = categories
+
+        result = await call_tool_helper(
+            self.mcp_app, "validate_staged_changes", repository_path=self.repo_path
+        )
+
+        assert result["recommendations"] == [
+            "Review large changes carefully before committing",
+            "Double-check critical file changes",
+            "Consider splitting large commits into smaller ones",
+            "Add tests for new functionality",
+        ]
+        assert result["summary"]["high_risk_files"] == 5
+        assert result["summary"]["critical_files"] == 3
+
+    async def test_staging_area_tools_registration(self):
+        """Test all staging area tools are registered on the server."""
+        tools = await self.mcp_app.get_tools()
+
+        assert set(STAGING_AREA_TOOLS) <= tools.keys()
+
+    async def test_staging_area_path_handling(self):
+        """Test every tool reports the resolved repository path."""
+        self.change_detector.detect_staged_changes.return_value = _READY_STAGED
+        self.git_client.get_diff.return_value = "+added"
+        self.diff_analyzer.categorize_changes.return_value = _READY_CATEGORIES
+        self.diff_analyzer.assess_risk.return_value = _LOW_RISK
+
+        expected_real = os.path.realpath(self.repo_path)
+        for tool_name in STAGING_AREA_TOOLS:
+            result = await call_tool_helper(
+                self.mcp_app, tool_name, repository_path=self.repo_path
+            )
+
+            assert os.path.realpath(result["repository_path"]) == expected_real
@@ -85,7 +85,6 @@ class GitTestRepo:
         return self
 
 
-@pytest.mark.asyncio
 @pytest.mark.skipif(
     os.getenv("CI") == "true",
     reason="Integration test requires MCP server setup not available in CI",
@@ -160,7 +159,6 @@ async def test_scenario_clean_repo():
                 )
 
 
-@pytest.mark.asyncio
 @pytest.mark.skipif(
     os.getenv("CI") == "true",
     reason="Integration test requires MCP server setup not available in CI",
@@ -204,7 +202,6 @@ async def test_scenario_working_directory_changes():
             ), "Should detect working directory changes"
 
 
-@pytest.mark.asyncio
 @pytest.mark.skipif(
     os.getenv("CI") == "true",
     reason="Integration test requires MCP server setup not available in CI",
@@ -244,7 +241,6 @@ async def test_scenario_staged_changes():
             assert data.get("ready_to_commit", False), "Should be ready to commit"
 
 
-@pytest.mark.asyncio
 @pytest.mark.skipif(
     os.getenv("CI") == "true",
     reason="Integration test requires MCP server setup not available in CI",
@@ -302,7 +298,6 @@ async def test_scenario_mixed_changes():
             ), "Should have outstanding work"
 
 
-@pytest.mark.asyncio
 @pytest.mark.skipif(
     os.getenv("CI") == "true",
     reason="Integration test requires MCP server setup not available in CI",
@@ -367,7 +362,6 @@ def test_server_startup():
 
 
 @pytest.mark.skip(reason="Requires running HTTP server at http://localhost:8000/mcp")
-@pytest.mark.asyncio
 async def test_http_server():
     """Test HTTP server functionality."""
     pass
@@ -0,0 +1,42 @@
+"""Fixtures applied to every unit test."""
+
+import asyncio
+
+import pytest
+
+
+def pytest_collection_modifyitems(config, items):
+    """Group unit tests by class so --dist=loadgroup keeps fixtures local.
+
+    Modules sharing module-scoped fixtures across classes declare their own
+    xdist_group, which is left in place.
+    """
+    for item in items:
+        if item.get_closest_marker("xdist_group"):
+            continue
+        group = item.cls.__name__ if item.cls else item.module.__name__
+        item.add_marker(pytest.mark.xdist_group(name=group))
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """Share one event loop across all async unit tests."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    """Make the server lifespan's startup sleep skip its delay.
+
+    The stub still yields to the loop once, so the lifespan keeps its
+    scheduling point.
+    """
+    real_sleep = asyncio.sleep
+
+    async def _sleep(delay, result=None):
+        await real_sleep(0)
+        return result
+
+    monkeypatch.setattr("mcp_local_repo_analyzer.main.asyncio.sleep", _sleep)
@@ -0,0 +1,104 @@
+"""Unit tests for the command line interface."""
+
+from unittest.mock import DEFAULT, MagicMock, Mock, patch
+
+import pytest
+
+from mcp_local_repo_analyzer.cli import main, parse_args
+
+
+class TestParseArgs:
+    """Test command line argument parsing."""
+
+    @pytest.mark.parametrize(
+        "argv, expected",
+        [
+            (
+                [],
+                {
+                    "transport": "stdio",
+                    "config": None,
+                    "port": None,
+                    "host": None,
+                    "log_level": "INFO",
+                },
+            ),
+            (
+                ["--transport", "http", "--host", "0.0.0.0", "--port", "9070"],
+                {"transport": "http", "host": "0.0.0.0", "port": 9070},
+            ),
+            (["--transport", "sse"], {"transport": "sse"}),
+            (["--config", "transport.yaml"], {"config": "transport.yaml"}),
+            (["--log-level", "DEBUG"], {"log_level": "DEBUG"}),
+        ],
+        ids=["defaults", "http", "sse", "config", "log_level"],
+    )
+    def test_parse_args(self, argv, expected):
+        """Test valid arguments are parsed into the namespace."""
+        with patch("sys.argv", ["cli.py", *argv]):
+            args = parse_args()
+
+        for name, value in expected.items():
+            assert getattr(args, name) == value
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["--transport", "carrier-pigeon"],
+            ["--port", "not-a-number"],
+            ["--log-level", "TRACE"],
+        ],
+        ids=["transport", "port", "log_level"],
+    )
+    def test_parse_args_invalid(self, argv):
+        """Test invalid arguments exit with a usage error."""
+        with patch("sys.argv", ["cli.py", *argv]), pytest.raises(SystemExit) as exc:
+            parse_args()
+
+        assert exc.value.code == 2
+
+
+class TestMain:
+    """Test the CLI entry point."""
+
+    @pytest.fixture(autouse=True)
+    def patches(self):
+        """Patch server startup once per test."""
+        with (
+            patch.multiple(
+                "mcp_local_repo_analyzer.cli",
+                create_server=Mock(return_value=(Mock(), MagicMock())),
+                register_tools=DEFAULT,
+                run_server=DEFAULT,
+            ) as cli_mocks,
+            patch("mcp_local_repo_analyzer.cli.logging.basicConfig"),
+            patch("mcp_local_repo_analyzer.main.main") as fastmcp_main,
+        ):
+            self.fastmcp_main = fastmcp_main
+            self.run_server = cli_mocks["run_server"]
+            yield
+
+    @pytest.mark.parametrize(
+        "argv, side_effect, expected_exit",
+        [
+            ([], None, None),
+            ([], KeyboardInterrupt, 0),
+            (["--transport", "http", "--port", "9070"], None, None),
+            (["--transport", "http"], RuntimeError("boom"), 1),
+        ],
+        ids=["stdio", "stdio_interrupt", "http", "http_error"],
+    )
+    def test_main(self, argv, side_effect, expected_exit):
+        """Test main dispatches by transport and maps failures to exit codes."""
+        entry = self.run_server if argv else self.fastmcp_main
+        entry.side_effect = side_effect
+
+        with patch("sys.argv", ["cli.py", *argv]):
+            if expected_exit is None:
+                main()
+            else:
+                with pytest.raises(SystemExit) as exc:
+                    main()
+                assert exc.value.code == expected_exit
+
+        entry.assert_called_once()
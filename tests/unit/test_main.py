@@ -0,0 +1,11 @@
+"""Unit tests for the server lifespan."""
+
+from mcp_local_repo_analyzer import main as server_main
+
+
+async def test_lifespan_marks_server_initialized(no_sleep):
+    """Test the server is flagged initialized only while the lifespan is open."""
+    async with server_main.lifespan(None):
+        assert server_main._server_initialized
+
+    assert not server_main._server_initialized
@@ -0,0 +1,82 @@
+"""Unit tests for the HTTP server runner."""
+
+import re
+from unittest.mock import ANY, Mock, call
+
+import pytest
+
+from mcp_local_repo_analyzer import main as server_main
+from mcp_local_repo_analyzer import run_http_server
+
+_CREATE_FAILED = re.compile("Server creation failed")
+_REGISTER_FAILED = re.compile("Tools registration failed")
+_RUN_FAILED = re.compile("Server run failed")
+
+
+@pytest.fixture
+def http_server_mocks(monkeypatch):
+    """Replace server construction and output for run_http_server.main."""
+    server = Mock()
+    services = {"git_client": Mock()}
+    create_server = Mock(return_value=(server, services))
+    register_tools = Mock()
+    print_mock = Mock()
+    monkeypatch.setattr(run_http_server, "create_server", create_server)
+    monkeypatch.setattr(run_http_server, "register_tools", register_tools)
+    monkeypatch.setattr("builtins.print", print_mock)
+    yield create_server, register_tools, print_mock, server, services
+
+
+class TestRunHTTPServer:
+    """Test the HTTP server runner."""
+
+    def test_module_imports(self):
+        """Test the runner uses the package's server factory directly."""
+        assert run_http_server.create_server is server_main.create_server
+        assert run_http_server.register_tools is server_main.register_tools
+
+    def test_main_success(self, http_server_mocks):
+        """Test the server is built, registered and run over streamable HTTP."""
+        create_server, register_tools, print_mock, server, services = http_server_mocks
+        manager = Mock()
+        manager.attach_mock(create_server, "create_server")
+        manager.attach_mock(register_tools, "register_tools")
+        manager.attach_mock(print_mock, "print")
+        manager.attach_mock(server.run, "run")
+
+        run_http_server.main()
+
+        assert manager.mock_calls == [
+            call.create_server(),
+            call.register_tools(server, services),
+            call.print(ANY),
+            call.run(transport="streamable-http", host="localhost", port=8000),
+        ]
+
+    def test_main_create_server_failure(self, http_server_mocks):
+        """Test a server creation error propagates before registration."""
+        create_server, register_tools, *_ = http_server_mocks
+        create_server.side_effect = RuntimeError("Server creation failed")
+
+        with pytest.raises(RuntimeError, match=_CREATE_FAILED):
+            run_http_server.main()
+
+        register_tools.assert_not_called()
+
+    def test_main_register_tools_failure(self, http_server_mocks):
+        """Test a registration error propagates before the server runs."""
+        _, register_tools, _, server, _ = http_server_mocks
+        register_tools.side_effect = RuntimeError("Tools registration failed")
+
+        with pytest.raises(RuntimeError, match=_REGISTER_FAILED):
+            run_http_server.main()
+
+        server.run.assert_not_called()
+
+    def test_main_run_failure(self, http_server_mocks):
+        """Test a server run error propagates."""
+        *_, server, _ = http_server_mocks
+        server.run.side_effect = RuntimeError("Server run failed")
+
+        with pytest.raises(RuntimeError, match=_RUN_FAILED):
+            run_http_server.main()
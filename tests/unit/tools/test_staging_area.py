@@ -0,0 +1,419 @@
+"""Unit tests for the staging area MCP tools."""
+
+import functools
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from fastmcp import Client, FastMCP
+
+from mcp_local_repo_analyzer.services.git.change_detector import ChangeDetector
+from mcp_local_repo_analyzer.services.git.diff_analyzer import DiffAnalyzer
+from mcp_local_repo_analyzer.tools.staging_area import register_staging_area_tools
+from mcp_shared_lib.models.analysis.categorization import ChangeCategorization
+from mcp_shared_lib.models.analysis.risk import RiskAssessment
+from mcp_shared_lib.models.git.changes import FileStatus, StagedChanges
+from mcp_shared_lib.services.git.git_client import GitClient
+
+
+# One worker per module so the module-scoped server and client are built once
+pytestmark = pytest.mark.xdist_group(name="staging_area_tools")
+
+
+@pytest.fixture(scope="module")
+def repo_path(tmp_path_factory):
+    """Directory that passes the tools' git repository check; never written to."""
+    path = tmp_path_factory.mktemp("repo")
+    (path / ".git").mkdir()
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def services_holder():
+    """Services dict the registered tools read from; refilled by each test."""
+    return {}
+
+
+@pytest.fixture(scope="module")
+def mcp_server(services_holder):
+    """FastMCP server with the staging area tools registered once per module."""
+    mcp = FastMCP()
+    register_staging_area_tools(mcp, services_holder)
+    return mcp
+
+
+@pytest.fixture
+def mock_services(services_holder):
+    """Install mocked services that default to an empty staging area."""
+    git_client = AsyncMock(spec=GitClient)
+    git_client.get_diff.return_value = ""
+    change_detector = AsyncMock(spec=ChangeDetector)
+    change_detector.detect_staged_changes.return_value = _staged_changes()
+    services_holder.update(
+        git_client=git_client,
+        change_detector=change_detector,
+        diff_analyzer=Mock(spec=DiffAnalyzer),
+    )
+    yield services_holder
+    services_holder.clear()
+
+
+@pytest.fixture(scope="module")
+async def client(mcp_server):
+    """In-memory client connected to the server once per module."""
+    async with Client(mcp_server) as connected:
+        yield connected
+
+
+@functools.lru_cache(maxsize=None)
+def _file_status(path, status_code, **fields):
+    """Validated staged FileStatus, built once per distinct set of fields."""
+    return FileStatus(path=path, status_code=status_code, staged=True, **fields)
+
+
+def _staged_changes(*files):
+    """StagedChanges over already-validated files, skipping re-validation."""
+    return StagedChanges.model_construct(staged_files=list(files))
+
+
+async def call_tool_helper(client, name, **kwargs):
+    """Call one of the registered tools and return its structured result."""
+    return (await client.call_tool(name, kwargs)).data
+
+
+# Canonical analyzer results; tests derive variants with model_copy(update=...)
+_LOW_RISK = RiskAssessment(risk_level="low")
+
+_HIGH_RISK = RiskAssessment(
+    risk_level="high",
+    risk_factors=["Critical files changed"],
+    large_changes=["Dockerfile"],
+    potential_conflicts=["Dockerfile"],
+)
+
+_EMPTY_CATEGORIZATION = ChangeCategorization()
+
+
+class TestAnalyzeStagedChanges:
+    """Test the analyze_staged_changes tool."""
+
+    async def test_analyze_staged_changes_with_files(
+        self, repo_path, client, mock_services
+    ):
+        """Test staged files, statistics and diffs are reported."""
+        staged = _staged_changes(
+            _file_status("src/main.py", "M", lines_added=10, lines_deleted=2),
+            _file_status("README.md", "A", lines_added=5),
+        )
+        mock_services["change_detector"].detect_staged_changes.return_value = staged
+        get_diff = mock_services["git_client"].get_diff
+        get_diff.return_value = "+new line"
+
+        result = await call_tool_helper(
+            client, "analyze_staged_changes", repository_path=repo_path
+        )
+
+        assert result["ready_to_commit"]
+        assert result["total_staged_files"] == 2
+        assert result["statistics"] == {"total_additions": 15, "total_deletions": 2}
+        assert [f["path"] for f in result["staged_files"]] == [
+            "src/main.py",
+            "README.md",
+        ]
+        assert result["diffs"] == [
+            {"file_path": "src/main.py", "diff_content": "+new line"},
+            {"file_path": "README.md", "diff_content": "+new line"},
+        ]
+        assert get_diff.await_count == 2
+
+    async def test_analyze_staged_changes_no_files(
+        self, repo_path, client, mock_services
+    ):
+        """Test an empty index is not ready to commit and has no diffs."""
+        result = await call_tool_helper(
+            client, "analyze_staged_changes", repository_path=repo_path
+        )
+
+        assert not result["ready_to_commit"]
+        assert result["total_staged_files"] == 0
+        assert "diffs" not in result
+        mock_services["git_client"].get_diff.assert_not_awaited()
+
+    async def test_analyze_staged_changes_binary_files(
+        self, repo_path, client, mock_services
+    ):
+        """Test binary files are reported without fetching a diff."""
+        staged = _staged_changes(_file_status("assets/logo.png", "A", is_binary=True))
+        mock_services["change_detector"].detect_staged_changes.return_value = staged
+
+        result = await call_tool_helper(
+            client, "analyze_staged_changes", repository_path=repo_path
+        )
+
+        assert result["diffs"] == [
+            {
+                "file_path": "assets/logo.png",
+                "is_binary": True,
+                "message": "Binary file - no diff available",
+            }
+        ]
+        mock_services["git_client"].get_diff.assert_not_awaited()
+
+    async def test_analyze_staged_changes_diff_error(
+        self, repo_path, client, mock_services
+    ):
+        """Test a failing diff is reported per file without failing the tool."""
+        staged = _staged_changes(_file_status("src/main.py", "M", lines_added=1))
+        mock_services["change_detector"].detect_staged_changes.return_value = staged
+        get_diff = mock_services["git_client"].get_diff
+        get_diff.side_effect = RuntimeError("bad object")
+
+        result = await call_tool_helper(
+            client, "analyze_staged_changes", repository_path=repo_path
+        )
+
+        assert result["ready_to_commit"]
+        assert result["diffs"] == [
+            {"file_path": "src/main.py", "error": "Failed to get diff: bad object"}
+        ]
+        assert get_diff.await_count == 1
+
+    async def test_analyze_staged_changes_large_diff(
+        self, repo_path, client, mock_services
+    ):
+        """Test diffs longer than 100 lines are truncated."""
+        staged = _staged_changes(_file_status("src/big.py", "M", lines_added=150))
+        mock_services["change_detector"].detect_staged_changes.return_value = staged
+        mock_services["git_client"].get_diff.return_value = "line\n" * 150
+
+        result = await call_tool_helper(
+            client, "analyze_staged_changes", repository_path=repo_path
+        )
+
+        diff_content = result["diffs"][0]["diff_content"]
+        assert diff_content == "line\n" * 100 + "... (truncated)"
+
+    async def test_analyze_staged_changes_many_files(
+        self, repo_path, client, mock_services
+    ):
+        """Test every file is listed but only the first ten diffs are fetched."""
+        staged = _staged_changes(
+            *(
+                FileStatus.model_construct(
+                    path=f"file_{i}.py",
+                    status_code="M",
+                    staged=True,
+                    lines_added=5,
+                    lines_deleted=2,
+                )
+                for i in range(15)
+            )
+        )
+        mock_services["change_detector"].detect_staged_changes.return_value = staged
+        get_diff = mock_services["git_client"].get_diff
+        get_diff.return_value = "+change"
+
+        result = await call_tool_helper(
+            client, "analyze_staged_changes", repository_path=repo_path
+        )
+
+        assert result["total_staged_files"] == 15
+        assert len(result["staged_files"]) == 15
+        assert len(result["diffs"]) == 10
+        assert get_diff.await_count == 10
+
+    async def test_analyze_staged_changes_invalid_repo(self, client, mock_services):
+        """Test a path outside any git repository returns an error."""
+        with (
+            patch(
+                "mcp_local_repo_analyzer.tools.staging_area.is_git_repository",
+                return_value=False,
+            ),
+            patch(
+                "mcp_local_repo_analyzer.tools.staging_area.find_git_root",
+                return_value=None,
+            ),
+        ):
+            result = await call_tool_helper(
+                client, "analyze_staged_changes", repository_path="/nowhere"
+            )
+
+        assert result == {"error": "No git repository found at or above /nowhere"}
+        mock_services["change_detector"].detect_staged_changes.assert_not_called()
+
+
+class TestPreviewCommit:
+    """Test the preview_commit tool."""
+
+    async def test_preview_commit_with_changes(self, repo_path, client, mock_services):
+        """Test the preview summarizes categories, file types and statuses."""
+        staged = _staged_changes(
+            _file_status("src/main.py", "M", lines_added=10, lines_deleted=2),
+            _file_status("tests/test_main.py", "A", lines_added=20),
+            _file_status("old.txt", "D"),
+        )
+        mock_services["change_detector"].detect_staged_changes.return_value = staged
+        categories = _EMPTY_CATEGORIZATION.model_copy(
+            update={
+                "source_code": ["src/main.py"],
+                "tests": ["tests/test_main.py"],
+                "other": ["old.txt"],
+            }
+        )
+        mock_services["diff_analyzer"].categorize_changes.return_value = categories
+
+        result = await call_tool_helper(
+            client, "preview_commit", repository_path=repo_path
+        )
+
+        assert result["ready_to_commit"]
+        assert result["summary"] == {
+            "total_files": 3,
+            "total_additions": 30,
+            "total_deletions": 2,
+        }
+        assert result["file_categories"] == {
+            "critical_files": 0,
+            "source_code": 1,
+            "documentation": 0,
+            "tests": 1,
+            "configuration": 0,
+            "other": 1,
+        }
+        assert result["file_types"] == {".py": 2, ".txt": 1}
+        assert result["files_by_status"] == {
+            "added": ["tests/test_main.py"],
+            "modified": ["src/main.py"],
+            "deleted": ["old.txt"],
+            "renamed": [],
+        }
+
+    async def test_preview_commit_no_changes(self, repo_path, client, mock_services):
+        """Test nothing is categorized when the index is empty."""
+        result = await call_tool_helper(
+            client, "preview_commit", repository_path=repo_path
+        )
+
+        assert not result["ready_to_commit"]
+        assert result["message"] == "No changes staged for commit"
+        mock_services["diff_analyzer"].categorize_changes.assert_not_called()
+
+    async def test_preview_commit_error(self, repo_path, client, mock_services):
+        """Test detector failures are returned as an error result."""
+        error = RuntimeError("index locked")
+        mock_services["change_detector"].detect_staged_changes.side_effect = error
+
+        result = await call_tool_helper(
+            client, "preview_commit", repository_path=repo_path
+        )
+
+        assert result == {"error": "Failed to preview commit: index locked"}
+
+
+class TestValidateStagedChanges:
+    """Test the validate_staged_changes tool."""
+
+    async def test_validate_staged_changes_low_risk(
+        self, repo_path, client, mock_services
+    ):
+        """Test low-risk changes with tests validate cleanly."""
+        staged = _staged_changes(
+            _file_status("src/main.py", "M", lines_added=10),
+            _file_status("tests/test_main.py", "M", lines_added=5),
+        )
+        mock_services["change_detector"].detect_staged_changes.return_value = staged
+        mock_services["diff_analyzer"].assess_risk.return_value = _LOW_RISK
+        categories = _EMPTY_CATEGORIZATION.model_copy(
+            update={"source_code": ["src/main.py"], "tests": ["tests/test_main.py"]}
+        )
+        mock_services["diff_analyzer"].categorize_changes.return_value = categories
+
+        result = await call_tool_helper(
+            client, "validate_staged_changes", repository_path=repo_path
+        )
+
+        assert result["valid"]
+        assert result["risk_level"] == "low"
+        assert result["warnings"] == []
+        assert result["errors"] == []
+        assert result["recommendations"] == []
+        assert result["summary"] == {
+            "total_files": 2,
+            "high_risk_files": 0,
+            "critical_files": 0,
+            "binary_files": 0,
+        }
+
+    async def test_validate_staged_changes_high_risk(
+        self, repo_path, client, mock_services
+    ):
+        """Test risk factors become warnings and conflicts become errors."""
+        staged = _staged_changes(
+            _file_status("Dockerfile", "M", lines_added=600),
+            _file_status("assets/logo.png", "A", is_binary=True),
+        )
+        mock_services["change_detector"].detect_staged_changes.return_value = staged
+        mock_services["diff_analyzer"].assess_risk.return_value = _HIGH_RISK
+        categories = _EMPTY_CATEGORIZATION.model_copy(
+            update={"critical_files": ["Dockerfile"], "other": ["assets/logo.png"]}
+        )
+        mock_services["diff_analyzer"].categorize_changes.return_value = categories
+
+        result = await call_tool_helper(
+            client, "validate_staged_changes", repository_path=repo_path
+        )
+
+        assert not result["valid"]
+        assert result["risk_level"] == "high"
+        assert result["warnings"] == [
+            "High-risk changes detected: Critical files changed",
+            "Large changes in 1 files",
+            "Critical files changed: 1",
+            "Binary files included: 1",
+        ]
+        assert result["errors"] == ["Potential conflicts detected in: Dockerfile"]
+        assert result["summary"]["binary_files"] == 1
+
+    async def test_validate_staged_changes_with_recommendations(
+        self, repo_path, client, mock_services
+    ):
+        """Test large untested commits get splitting and test recommendations."""
+        mock_staged_files = [
+            FileStatus.model_construct(
+                path=f"src/module_{i}.py",
+                status_code="M",
+                staged=True,
+                lines_added=5,
+                lines_deleted=2,
+            )
+            for i in range(12)
+        ]
+        staged = _staged_changes(*mock_staged_files)
+        mock_services["change_detector"].detect_staged_changes.return_value = staged
+        risk = _LOW_RISK.model_copy(update={"risk_level": "medium"})
+        mock_services["diff_analyzer"].assess_risk.return_value = risk
+        categories = _EMPTY_CATEGORIZATION.model_copy(
+            update={"source_code": [f.path for f in mock_staged_files]}
+        )
+        mock_services["diff_analyzer"].categorize_changes.return_value = categories
+
+        result = await call_tool_helper(
+            client, "validate_staged_changes", repository_path=repo_path
+        )
+
+        assert result["valid"]
+        assert result["recommendations"] == [
+            "Consider splitting large commits into smaller ones",
+            "Add tests for new functionality",
+        ]
+
+    async def test_validate_staged_changes_no_changes(
+        self, repo_path, client, mock_services
+    ):
+        """Test validation does not apply to an empty index."""
+        result = await call_tool_helper(
+            client, "validate_staged_changes", repository_path=repo_path
+        )
+
+        assert not result["valid"]
+        assert result["message"] == "No changes staged for commit"
+        mock_services["diff_analyzer"].assess_risk.assert_not_called()
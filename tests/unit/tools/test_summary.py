@@ -0,0 +1,636 @@
+"""Unit tests for the summary and analysis MCP tools."""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from fastmcp import Client, FastMCP
+
+from mcp_local_repo_analyzer.services.git.change_detector import ChangeDetector
+from mcp_local_repo_analyzer.services.git.diff_analyzer import DiffAnalyzer
+from mcp_local_repo_analyzer.services.git.status_tracker import StatusTracker
+from mcp_local_repo_analyzer.tools.summary import register_summary_tools
+from mcp_shared_lib.models import (
+    BranchStatus,
+    ChangeCategorization,
+    FileStatus,
+    LocalRepository,
+    RepositoryStatus,
+    RiskAssessment,
+    StagedChanges,
+    StashedChanges,
+    UnpushedCommit,
+    WorkingDirectoryChanges,
+)
+from mcp_shared_lib.services.git.git_client import GitClient
+
+
+# One worker per module so the module-scoped server and client are built once
+pytestmark = pytest.mark.xdist_group(name="summary_tools")
+
+
+@pytest.fixture(scope="module")
+def repo_path(tmp_path_factory):
+    """Directory the tools recognise as a git repository; never written to."""
+    path = tmp_path_factory.mktemp("repo")
+    (path / ".git").mkdir()
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def services_holder():
+    """Service mocks built once per module; reset by mock_services."""
+    return {
+        "git_client": AsyncMock(spec_set=GitClient),
+        "status_tracker": AsyncMock(spec_set=StatusTracker),
+        "diff_analyzer": Mock(spec_set=DiffAnalyzer),
+        "change_detector": AsyncMock(spec_set=ChangeDetector),
+    }
+
+
+@pytest.fixture(scope="module")
+def summary_mcp(services_holder):
+    """FastMCP server with the summary tools registered once per module."""
+    mcp = FastMCP()
+    register_summary_tools(mcp, services_holder)
+    return mcp
+
+
+@pytest.fixture
+def mock_services(services_holder):
+    """Service mocks with configured results and recorded calls cleared."""
+    yield services_holder
+    for service in services_holder.values():
+        service.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture(scope="module")
+async def client(summary_mcp):
+    """In-memory client connected to the server once per module."""
+    async with Client(summary_mcp) as connected:
+        yield connected
+
+
+@pytest.fixture(scope="module")
+def repository(repo_path):
+    """LocalRepository model for repo_path."""
+    return LocalRepository(
+        path=repo_path, name="repo", current_branch="main", head_commit="abc123"
+    )
+
+
+@pytest.fixture
+def repo_status_factory(repository):
+    """Build a RepositoryStatus for repository; a clean main branch by default."""
+
+    def make(**overrides):
+        fields = {
+            "repository": repository,
+            "working_directory": _EMPTY_WORKING_DIRECTORY,
+            "staged_changes": _EMPTY_STAGED,
+            "branch_status": _MAIN_BRANCH,
+        }
+        fields.update(overrides)
+        return RepositoryStatus(**fields)
+
+    return make
+
+
+async def call_tool_helper(client, name, **kwargs):
+    """Call one of the registered tools and return its structured result."""
+    return (await client.call_tool(name, kwargs)).data
+
+
+_FIXED_NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+# Clean repository defaults; models are reused, never mutated
+_EMPTY_WORKING_DIRECTORY = WorkingDirectoryChanges()
+
+_EMPTY_STAGED = StagedChanges()
+
+_MAIN_BRANCH = BranchStatus(current_branch="main")
+
+_MAIN_PY_MODIFIED = FileStatus(path="src/main.py", status_code="M", staged=False)
+
+_TEST_PY_ADDED = FileStatus(path="tests/test.py", status_code="A", staged=True)
+
+_SAMPLE_COMMIT = UnpushedCommit(
+    sha="def456",
+    message="Test commit",
+    author="Test Author",
+    author_email="test@example.com",
+    date=_FIXED_NOW,
+)
+
+_MAIN_PY_WORKING_DIRECTORY = WorkingDirectoryChanges(modified_files=[_MAIN_PY_MODIFIED])
+
+_TEST_PY_STAGED = StagedChanges(staged_files=[_TEST_PY_ADDED])
+
+_SUMMARY_SCENARIOS = [
+    pytest.param(
+        {
+            "working_directory": _MAIN_PY_WORKING_DIRECTORY,
+            "staged_changes": _TEST_PY_STAGED,
+            "unpushed_commits": [_SAMPLE_COMMIT],
+            "branch_status": BranchStatus(
+                current_branch="main",
+                upstream_branch="origin/main",
+                ahead_by=1,
+                is_up_to_date=False,
+                needs_push=True,
+            ),
+        },
+        ChangeCategorization(source_code=["src/main.py"], tests=["tests/test.py"]),
+        RiskAssessment(risk_level="low"),
+        True,
+        {
+            "has_outstanding_work": True,
+            "total_outstanding_changes": 3,
+            "quick_stats": {
+                "working_directory_changes": 1,
+                "staged_changes": 1,
+                "unpushed_commits": 1,
+                "stashed_changes": 0,
+            },
+            "branch_status": {
+                "current": "main",
+                "upstream": "origin/main",
+                "sync_status": "1 commit(s) ahead",
+                "ahead_by": 1,
+                "behind_by": 0,
+                "needs_push": True,
+                "needs_pull": False,
+            },
+            "risk_assessment": {
+                "risk_level": "low",
+                "score": 2,
+                "factors": [],
+                "large_changes": [],
+                "potential_conflicts": [],
+            },
+            "recommendations": [
+                "📝 Commit working directory changes when ready",
+                "✅ Commit staged changes",
+                "🚀 Push commits to remote when ready",
+            ],
+            "detailed_breakdown": {
+                "working_directory": {
+                    "modified": 1,
+                    "added": 0,
+                    "deleted": 0,
+                    "renamed": 0,
+                    "untracked": 0,
+                },
+                "file_categories": {
+                    "critical": 0,
+                    "source_code": 1,
+                    "documentation": 0,
+                    "tests": 1,
+                    "configuration": 0,
+                    "other": 0,
+                },
+                "risk_factors": {
+                    "large_changes": [],
+                    "potential_conflicts": [],
+                    "binary_changes": [],
+                },
+            },
+        },
+        id="with_changes",
+    ),
+    pytest.param(
+        {},
+        ChangeCategorization(),
+        RiskAssessment(risk_level="low"),
+        False,
+        {
+            "has_outstanding_work": False,
+            "total_outstanding_changes": 0,
+            "recommendations": [],
+        },
+        id="clean",
+    ),
+    pytest.param(
+        {
+            "working_directory": WorkingDirectoryChanges(
+                modified_files=[
+                    FileStatus(
+                        path="Dockerfile",
+                        status_code="M",
+                        staged=False,
+                        lines_added=300,
+                    )
+                ]
+            ),
+        },
+        ChangeCategorization(critical_files=["Dockerfile"]),
+        RiskAssessment(
+            risk_level="high",
+            risk_factors=["Critical files changed"],
+            large_changes=["Dockerfile"],
+        ),
+        True,
+        {
+            "risk_assessment": {
+                "risk_level": "high",
+                "score": 8,
+                "factors": ["Critical files changed"],
+                "large_changes": ["Dockerfile"],
+                "potential_conflicts": [],
+            },
+            "recommendations": [
+                "⚠️  Review high-risk changes carefully before committing",
+                "📝 Commit working directory changes when ready",
+                "🔍 Extra review needed for critical file changes",
+            ],
+        },
+        id="high_risk",
+    ),
+]
+
+_PUSH_READINESS_SCENARIOS = [
+    pytest.param(
+        {
+            "unpushed_commits": [_SAMPLE_COMMIT],
+            "branch_status": BranchStatus(
+                current_branch="main", upstream_branch="origin/main", ahead_by=1
+            ),
+        },
+        {
+            "ready_to_push": True,
+            "unpushed_commits": 1,
+            "blockers": [],
+            "action_plan": ["Ready to push!"],
+            "branch_status": {
+                "ahead_by": 1,
+                "behind_by": 0,
+                "upstream": "origin/main",
+            },
+        },
+        id="ready",
+    ),
+    pytest.param(
+        {
+            "working_directory": _MAIN_PY_WORKING_DIRECTORY,
+            "staged_changes": _TEST_PY_STAGED,
+            "unpushed_commits": [_SAMPLE_COMMIT],
+            "branch_status": BranchStatus(
+                current_branch="main", ahead_by=1, behind_by=2
+            ),
+        },
+        {
+            "ready_to_push": False,
+            "blockers": [
+                "Uncommitted changes in working directory",
+                "Staged changes not yet committed",
+                "Branch is 2 commits behind remote",
+            ],
+            "action_plan": [
+                "Commit or stash uncommitted changes",
+                "Commit staged changes",
+                "Pull latest changes from remote",
+            ],
+        },
+        id="blocked",
+    ),
+    pytest.param(
+        {
+            "stashed_changes": [
+                StashedChanges(
+                    stash_index=0, message="WIP on main", branch="main", date=_FIXED_NOW
+                )
+            ],
+        },
+        {
+            "ready_to_push": False,
+            "has_commits_to_push": False,
+            "warnings": ["No new commits to push", "1 stashed changes present"],
+            "action_plan": ["No commits to push"],
+        },
+        id="no_commits",
+    ),
+]
+
+_STASH_SCENARIOS = [
+    pytest.param(
+        {
+            "return_value": [
+                StashedChanges(
+                    stash_index=0,
+                    message="WIP on main",
+                    branch="main",
+                    date=_FIXED_NOW,
+                    files_affected=["src/main.py"],
+                ),
+                StashedChanges(
+                    stash_index=1,
+                    message="Experiment",
+                    branch="feature",
+                    date=_FIXED_NOW,
+                ),
+            ]
+        },
+        {
+            "has_stashes": True,
+            "total_stashes": 2,
+            "stashes": [
+                {
+                    "index": 0,
+                    "name": "stash@{0}",
+                    "message": "WIP on main",
+                    "branch": "main",
+                    "date": "2024-01-01T12:00:00",
+                    "files_affected": ["src/main.py"],
+                },
+                {
+                    "index": 1,
+                    "name": "stash@{1}",
+                    "message": "Experiment",
+                    "branch": "feature",
+                    "date": "2024-01-01T12:00:00",
+                    "files_affected": [],
+                },
+            ],
+            "recommendations": [
+                "Review and apply relevant stashes",
+                "Clean up old stashes that are no longer needed",
+                "Consider committing stashed changes if they're ready",
+            ],
+        },
+        id="with_stashes",
+    ),
+    pytest.param(
+        {"return_value": []},
+        {
+            "has_stashes": False,
+            "total_stashes": 0,
+            "message": "No stashed changes found",
+        },
+        id="no_stashes",
+    ),
+    pytest.param(
+        {"side_effect": RuntimeError("git failed")},
+        {"error": "Failed to analyze stashed changes: git failed"},
+        id="error",
+    ),
+]
+
+
+class TestGetOutstandingSummary:
+    """Test the get_outstanding_summary tool."""
+
+    @pytest.fixture(autouse=True)
+    def _setup(self, mock_services):
+        """Report main as the current branch."""
+        mock_services["git_client"].get_branch_info.return_value = {
+            "current_branch": "main"
+        }
+
+    @pytest.mark.parametrize(
+        "status_fields, categories, risk, detailed, expected", _SUMMARY_SCENARIOS
+    )
+    async def test_get_outstanding_summary(
+        self,
+        client,
+        mock_services,
+        repo_path,
+        repo_status_factory,
+        status_fields,
+        categories,
+        risk,
+        detailed,
+        expected,
+    ):
+        """Test the summary reflects the repository status and analysis."""
+        tracker = mock_services["status_tracker"]
+        tracker.get_repository_status.return_value = repo_status_factory(
+            **status_fields
+        )
+        analyzer = mock_services["diff_analyzer"]
+        analyzer.categorize_changes.return_value = categories
+        analyzer.assess_risk.return_value = risk
+
+        result = await call_tool_helper(
+            client,
+            "get_outstanding_summary",
+            repository_path=repo_path,
+            detailed=detailed,
+        )
+
+        assert {key: result[key] for key in expected} == expected
+        assert ("detailed_breakdown" in result) == detailed
+        tracker.get_repository_status.assert_awaited_once()
+
+    async def test_get_outstanding_summary_invalid_repo(
+        self, client, mock_services, tmp_path
+    ):
+        """Test a directory outside any git repository is reported as an error."""
+        result = await call_tool_helper(
+            client, "get_outstanding_summary", repository_path=str(tmp_path)
+        )
+
+        assert result == {
+            "error": f"No git repository found at or above {tmp_path.resolve()}"
+        }
+        mock_services["status_tracker"].get_repository_status.assert_not_awaited()
+
+
+class TestAnalyzeRepositoryHealth:
+    """Test the analyze_repository_health tool."""
+
+    async def test_analyze_repository_health_excellent(
+        self, client, mock_services, repo_path
+    ):
+        """Test a clean, in-sync repository scores full marks."""
+        mock_services["status_tracker"].get_health_metrics.return_value = {
+            "has_uncommitted_changes": False,
+            "staged_changes_count": 0,
+            "unpushed_commits_count": 0,
+            "stashed_changes_count": 0,
+            "branch_sync_status": "up to date",
+        }
+
+        result = await call_tool_helper(
+            client, "analyze_repository_health", repository_path=repo_path
+        )
+
+        assert result["health_score"] == 100
+        assert result["health_status"] == "excellent"
+        assert result["issues"] == []
+        assert result["recommendations"] == ["Repository health is good!"]
+
+    async def test_analyze_repository_health_needs_attention(
+        self, client, mock_services, repo_path
+    ):
+        """Test every penalty applies to a neglected, diverged repository."""
+        mock_services["status_tracker"].get_health_metrics.return_value = {
+            "has_uncommitted_changes": True,
+            "staged_changes_count": 2,
+            "unpushed_commits_count": 8,
+            "stashed_changes_count": 1,
+            "branch_sync_status": "diverged (8 ahead, 2 behind)",
+        }
+
+        result = await call_tool_helper(
+            client, "analyze_repository_health", repository_path=repo_path
+        )
+
+        assert result["health_score"] == 0
+        assert result["health_status"] == "needs_attention"
+        assert result["issues"] == [
+            "Uncommitted changes in working directory",
+            "2 staged changes not committed",
+            "8 unpushed commits",
+            "1 stashed changes",
+            "Branch is behind remote",
+            "Branch has diverged from remote",
+        ]
+
+    async def test_analyze_repository_health_error(
+        self, client, mock_services, repo_path
+    ):
+        """Test a failing status tracker is reported as an error."""
+        tracker = mock_services["status_tracker"]
+        tracker.get_health_metrics.side_effect = RuntimeError("git failed")
+
+        result = await call_tool_helper(
+            client, "analyze_repository_health", repository_path=repo_path
+        )
+
+        assert result == {"error": "Failed to analyze repository health: git failed"}
+
+
+class TestGetPushReadiness:
+    """Test the get_push_readiness tool."""
+
+    @pytest.fixture(autouse=True)
+    def _setup(self, mock_services):
+        """Report main as the current branch."""
+        mock_services["git_client"].get_branch_info.return_value = {
+            "current_branch": "main"
+        }
+
+    @pytest.mark.parametrize("status_fields, expected", _PUSH_READINESS_SCENARIOS)
+    async def test_get_push_readiness(
+        self,
+        client,
+        mock_services,
+        repo_path,
+        repo_status_factory,
+        status_fields,
+        expected,
+    ):
+        """Test push readiness follows from the repository status."""
+        tracker = mock_services["status_tracker"]
+        tracker.get_repository_status.return_value = repo_status_factory(
+            **status_fields
+        )
+
+        result = await call_tool_helper(
+            client, "get_push_readiness", repository_path=repo_path
+        )
+
+        assert {key: result[key] for key in expected} == expected
+
+
+class TestAnalyzeStashedChanges:
+    """Test the analyze_stashed_changes tool."""
+
+    @pytest.mark.parametrize("detect_stashes, expected", _STASH_SCENARIOS)
+    async def test_analyze_stashed_changes(
+        self, client, mock_services, repo_path, detect_stashes, expected
+    ):
+        """Test the stash report follows from the detected stashes."""
+        detector = mock_services["change_detector"]
+        detector.detect_stashed_changes.configure_mock(**detect_stashes)
+
+        result = await call_tool_helper(
+            client, "analyze_stashed_changes", repository_path=repo_path
+        )
+
+        assert {key: result[key] for key in expected} == expected
+
+
+class TestDetectConflicts:
+    """Test the detect_conflicts tool."""
+
+    @pytest.fixture(autouse=True)
+    def _setup(self, mock_services):
+        """Report feature as the current branch."""
+        mock_services["git_client"].get_branch_info.return_value = {
+            "current_branch": "feature"
+        }
+
+    async def test_detect_conflicts_on_target_branch(
+        self, client, mock_services, repo_path
+    ):
+        """Test checking against the current branch is skipped."""
+        result = await call_tool_helper(
+            client,
+            "detect_conflicts",
+            repository_path=repo_path,
+            target_branch="feature",
+        )
+
+        assert not result["has_potential_conflicts"]
+        assert result["message"] == "Cannot check conflicts - already on target branch"
+        detector = mock_services["change_detector"]
+        detector.detect_working_directory_changes.assert_not_awaited()
+
+    async def test_detect_conflicts_high_risk_files(
+        self, client, mock_services, repo_path
+    ):
+        """Test config, renamed and heavily changed files are flagged."""
+        detector = mock_services["change_detector"]
+        detector.detect_working_directory_changes.return_value = (
+            WorkingDirectoryChanges(
+                modified_files=[
+                    FileStatus(path="config.yaml", status_code="M"),
+                    FileStatus(path="src/main.py", status_code="M", lines_added=5),
+                ],
+                renamed_files=[FileStatus(path="src/new.py", status_code="R")],
+            )
+        )
+        detector.detect_staged_changes.return_value = StagedChanges(
+            staged_files=[
+                FileStatus(
+                    path="src/big.py", status_code="M", staged=True, lines_added=60
+                )
+            ]
+        )
+        mock_services["diff_analyzer"].assess_risk.return_value = RiskAssessment(
+            risk_level="medium", potential_conflicts=["config.yaml"]
+        )
+
+        result = await call_tool_helper(
+            client, "detect_conflicts", repository_path=repo_path
+        )
+
+        assert result["has_potential_conflicts"]
+        assert result["potential_conflict_files"] == ["config.yaml"]
+        assert result["high_risk_files"] == ["config.yaml", "src/new.py", "src/big.py"]
+        assert result["total_changed_files"] == 4
+        assert result["recommendations"] == [
+            "Test merge in a separate branch first",
+            "Commit all changes before merging",
+            "Pull latest changes from target branch",
+        ]
+
+    async def test_detect_conflicts_none(self, client, mock_services, repo_path):
+        """Test a clean branch reports no conflict risk."""
+        detector = mock_services["change_detector"]
+        detector.detect_working_directory_changes.return_value = (
+            _EMPTY_WORKING_DIRECTORY
+        )
+        detector.detect_staged_changes.return_value = _EMPTY_STAGED
+        mock_services["diff_analyzer"].assess_risk.return_value = RiskAssessment(
+            risk_level="low"
+        )
+
+        result = await call_tool_helper(
+            client, "detect_conflicts", repository_path=repo_path
+        )
+
+        assert not result["has_potential_conflicts"]
+        assert result["risk_level"] == "low"
+        assert result["recommendations"] == ["Pull latest changes from target branch"]